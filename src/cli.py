@@ -2,18 +2,44 @@
 from pathlib import Path
 import argparse
 import logging
+import signal
+import sys
+import threading
 from datetime import datetime, timezone
+from functools import partial
 
-import cv2
 import numpy as np
 
 from src.hardware.camera_manager import CameraManager
 from src.hardware.exceptions import CameraError, FrameCaptureError
 from src.hardware.frame_capture import FrameCapturer
+from src.preview import PreviewWindow
 from src.recorder import DataRecorder
+from src.saver_process import SaverProcess
 
 logger = logging.getLogger(__name__)
 
+PROGRESS_LOG_INTERVAL = 300  # frames between progress log lines (~10 s at 30 fps)
+
+# Stored depth representation -> dtype of the meters lookup table (None = raw)
+DEPTH_FORMATS = {
+    "uint16_mm": None,
+    "f16_m": np.float16,
+    "f32_m": np.float32,
+}
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {value}")
+    return number
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
@@ -32,13 +58,66 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Disable OpenCV preview windows while recording",
     )
+    parser.add_argument(
+        "--preview-fps",
+        type=_positive_float,
+        default=15.0,
+        help="Maximum preview refresh rate; capture rate is unaffected (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rgb-codec",
+        default="png",
+        choices=DataRecorder.RGB_CODECS,
+        help=(
+            "RGB output format: PNG per frame, JPEG per frame, or a single "
+            "H.264 rgb.mp4 (requires PyAV) (default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--depth-storage",
+        default="png",
+        choices=DataRecorder.DEPTH_STORAGES,
+        help=(
+            "Depth output format: 16-bit PNG per frame, one raw depth.bin blob, "
+            "or NPY per frame (default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--depth-format",
+        default="uint16_mm",
+        choices=list(DEPTH_FORMATS),
+        help=(
+            "Stored depth values: raw uint16 millimeters, or float16/float32 meters "
+            "(float formats need --depth-storage bin or npy) (default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--save-process",
+        action="store_true",
+        help=(
+            "Encode and write frames in a separate process fed through shared "
+            "memory, keeping the capture process free of encoder work"
+        ),
+    )
+    parser.add_argument(
+        "--sync-every",
+        type=_non_negative_int,
+        default=0,
+        help=(
+            "fdatasync written files in batches of N frames; 0 syncs only once "
+            "when recording ends (default: %(default)s)"
+        ),
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
         choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"],
         help="Logging verbosity (default: INFO)",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.depth_format != "uint16_mm" and args.depth_storage == "png":
+        parser.error(f"--depth-format {args.depth_format} requires --depth-storage bin or npy")
+    return args
 
 def _configure_logging(level: str) -> None:
     numeric_level = getattr(logging, level.upper(), logging.INFO)
@@ -48,12 +127,24 @@ def _configure_logging(level: str) -> None:
     )
 
 
-def _render_depth_preview(depth_array: np.ndarray) -> np.ndarray:
-    depth_clipped = np.clip(depth_array, 0, np.percentile(depth_array, 99))
-    depth_normalized = cv2.normalize(
-        depth_clipped, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U
-    )
-    return cv2.applyColorMap(depth_normalized, cv2.COLORMAP_JET)
+def _install_stop_listeners(stop_event: threading.Event) -> None:
+    """Let SIGTERM and typing "q" + Enter in the terminal end the recording."""
+    def _on_sigterm(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+    if sys.stdin is None or not sys.stdin.isatty():
+        return
+
+    def _watch_stdin():
+        for line in sys.stdin:
+            if line.strip().lower() in ("q", "quit"):
+                logger.info("Quit command received on stdin")
+                stop_event.set()
+                return
+
+    threading.Thread(target=_watch_stdin, name="stdin-quit", daemon=True).start()
 
 
 def main() -> int:
@@ -63,7 +154,17 @@ def main() -> int:
     logger.info("Starting RealSense camera recording session")
     logger.info("Using device index: %s", args.device_index)
     logger.info("Output directory: %s", args.output_dir)
-    logger.info("Preview: %s", "enabled" if not args.no_preview else "disabled")
+    logger.info(
+        "Preview: %s",
+        f"enabled ({args.preview_fps:g} fps)" if not args.no_preview else "disabled",
+    )
+    logger.info("RGB codec: %s", args.rgb_codec)
+    logger.info("Depth storage: %s (%s)", args.depth_storage, args.depth_format)
+    logger.info("Saver: %s", "separate process" if args.save_process else "in-process threads")
+    logger.info(
+        "Disk sync: %s",
+        f"every {args.sync_every} frames" if args.sync_every else "on close only",
+    )
     logger.info("Log level: %s", args.log_level)
 
     camera_manager = CameraManager()
@@ -74,8 +175,39 @@ def main() -> int:
         logger.error("Camera initialization failed: %s", exc)
         return 1
 
-    frame_capturer = FrameCapturer(camera_manager)
-    recorder = DataRecorder()
+    frame_capturer = FrameCapturer(camera_manager, shared_memory=args.save_process)
+
+    depth_lut = None
+    if DEPTH_FORMATS[args.depth_format] is not None:
+        depth_lut = frame_capturer.get_depth_lut(DEPTH_FORMATS[args.depth_format])
+
+    recorder_kwargs = {
+        "depth_storage": args.depth_storage,
+        "rgb_codec": args.rgb_codec,
+        "video_fps": CameraManager.RGB_FPS,
+        "depth_lut": depth_lut,
+        "sync_every": args.sync_every,
+    }
+    try:
+        if args.save_process:
+            recorder = SaverProcess(frame_capturer.ring, recorder_kwargs)
+        else:
+            recorder = DataRecorder(**recorder_kwargs)
+    except (RuntimeError, ValueError) as exc:
+        logger.error("Recorder initialization failed: %s", exc)
+        frame_capturer.close()
+        camera_manager.disconnect()
+        return 1
+
+    # Set by the preview exit keys, "q" on stdin or SIGTERM; checked once per frame
+    stop_requested = threading.Event()
+    _install_stop_listeners(stop_requested)
+
+    preview = None
+    preview_stride = max(1, round(CameraManager.RGB_FPS / args.preview_fps))
+    if not args.no_preview:
+        preview = PreviewWindow(exit_event=stop_requested)
+        preview.start()
 
     session_dir = recorder.create_session_directory(args.output_dir)
     logger.info("Recording to session directory: %s", session_dir)
@@ -86,6 +218,12 @@ def main() -> int:
         "camera_info": camera_manager.get_camera_info(),
         "log_level": args.log_level,
         "preview_enabled": not args.no_preview,
+        "preview_fps": args.preview_fps,
+        "rgb_codec": args.rgb_codec,
+        "depth_storage": args.depth_storage,
+        "depth_format": args.depth_format,
+        "save_process": args.save_process,
+        "sync_every": args.sync_every,
     }
 
     frame_idx = 0
@@ -93,38 +231,77 @@ def main() -> int:
 
     try:
         while True:
-            rgb_frame, depth_frame = frame_capturer.capture_frame()
-            recorder.save_frame_pair(frame_idx, rgb_frame, depth_frame, session_dir)
+            slot = frame_capturer.capture_frame()
+            rgb_frame, depth_frame = frame_capturer.get_slot(slot)
 
+            # The preview keeps its own copy; the slot is recycled once written
+            if preview is not None and frame_idx % preview_stride == 0:
+                preview.submit(rgb_frame.copy(), depth_frame.copy())
+
+            if args.save_process:
+                recorder.save_slot(frame_idx, slot)
+            else:
+                recorder.save_frame_pair(
+                    frame_idx,
+                    rgb_frame,
+                    depth_frame,
+                    on_written=partial(frame_capturer.release_slot, slot),
+                )
             captured_frames += 1
-            frame_idx += 1
 
-            if not args.no_preview:
-                cv2.imshow("RealSense RGB", rgb_frame)
-                cv2.imshow("RealSense Depth", _render_depth_preview(depth_frame))
-                if cv2.waitKey(1) & 0xFF in (ord("q"), 27):
-                    logger.info("Preview exit key detected, stopping recording")
-                    break
+            if captured_frames % PROGRESS_LOG_INTERVAL == 0:
+                logger.info("Captured %d frames", captured_frames)
+
+            if stop_requested.is_set():
+                logger.info("Stop requested, stopping recording")
+                break
+
+            frame_idx += 1
 
     except KeyboardInterrupt:
         logger.info("Recording interrupted by user")
     except FrameCaptureError as exc:
         logger.error("Frame capture error: %s", exc)
+    except (RuntimeError, OSError) as exc:
+        # A failed earlier write, re-raised by save_frame_pair / save_slot
+        logger.error("Frame write failed, stopping recording: %s", exc)
     finally:
-        if not args.no_preview:
-            cv2.destroyAllWindows()
+        if preview is not None:
+            preview.close()
 
         metadata["session_end"] = datetime.now(timezone.utc).isoformat()
+
+        # A dead saver process raises RuntimeError; cleanup below must still run
+        try:
+            failed_writes = recorder.flush()
+            if failed_writes:
+                logger.error("%s frame pair(s) failed to write", failed_writes)
+        except RuntimeError as exc:
+            logger.error("Failed to flush recorder: %s", exc)
+
         metadata["frame_count"] = captured_frames
+        metadata["dropped_frames"] = frame_capturer.get_dropped_frames()
         try:
             metadata["depth_scale"] = frame_capturer.get_depth_scale()
         except FrameCaptureError as exc:
             logger.warning("Failed to obtain depth scale: %s", exc)
 
-        recorder.save_metadata(session_dir, metadata)
+        try:
+            recorder.save_metadata(session_dir, metadata)
+        except RuntimeError as exc:
+            logger.error("Failed to save metadata: %s", exc)
+        try:
+            recorder.close()
+        except RuntimeError as exc:
+            logger.error("Failed to close recorder: %s", exc)
+        frame_capturer.close()
         camera_manager.disconnect()
 
-    logger.info("Recording session complete - frames captured: %s", captured_frames)
+    logger.info(
+        "Recording session complete - frames captured: %s, dropped: %s",
+        captured_frames,
+        frame_capturer.get_dropped_frames(),
+    )
     return 0
 
 if __name__ == "__main__":
@@ -27,16 +27,27 @@ class CameraManager:
     DEPTH_FPS = 30
     DEPTH_FORMAT = rs.format.z16  # 16-bit depth
 
+    # Keep only the newest frame in each sensor queue so a slow consumer sees
+    # dropped frames instead of ever-growing latency
+    FRAMES_QUEUE_SIZE = 1
+
     def __init__(self):
 
         self.pipeline: Optional[rs.pipeline] = None
         self.config: Optional[rs.config] = None
         self.device: Optional[rs.device] = None
 
+        # Creating an rs.context runs USB discovery (100-500 ms on Linux),
+        # so it is created once and shared; connect() reuses the last listing
+        self._rs_ctx: Optional[rs.context] = None
+        self._devices: Optional[List[Dict[str, str]]] = None
+
     def enumerate_devices(self) -> List[Dict[str, str]]:
         """
         Enumerate all connected RealSense devices.
 
+        The result is remembered and reused by connect().
+
         Returns:
             list: List of device info dictionaries
 
@@ -48,10 +59,11 @@ class CameraManager:
             # ]
         """
         try:
-            context = rs.context()
+            if self._rs_ctx is None:
+                self._rs_ctx = rs.context()
             devices = []
 
-            for dev in context.devices:
+            for dev in self._rs_ctx.devices:
                 device_info = {
                     'name': dev.get_info(rs.camera_info.name),
                     'serial': dev.get_info(rs.camera_info.serial_number),
@@ -61,6 +73,7 @@ class CameraManager:
                 devices.append(device_info)
 
             logger.info(f"Found {len(devices)} RealSense device(s)")
+            self._devices = devices
             return devices
 
 
@@ -78,8 +91,10 @@ class CameraManager:
 
         """
         try:
-            # check if device exists
-            devices = self.enumerate_devices()
+            # check if device exists, reusing an earlier listing when there is one;
+            # it is consumed here so a later connect re-enumerates (devices may be replugged)
+            devices = self._devices or self.enumerate_devices()
+            self._devices = None
             if not devices:
                 raise CameraConnectionError("No RealSense devices detected")
             
@@ -89,8 +104,8 @@ class CameraManager:
                     f"(found {len(devices)} device(s))"
                 )
             
-            # Initialize pipeline
-            self.pipeline = rs.pipeline()
+            # Initialize pipeline on the shared context (avoids another discovery)
+            self.pipeline = rs.pipeline(self._rs_ctx)
             self.config = rs.config()
 
             target_device = devices[device_index]
@@ -105,6 +120,8 @@ class CameraManager:
             # Get device and camera info
             self.device = profile.get_device()
 
+            self._limit_frame_queues()
+
         except Exception as e:
             logger.error(f"Camera connection failed: {e}")
             raise CameraConnectionError(f"Failed to connect: {str(e)}")
@@ -117,6 +134,7 @@ class CameraManager:
             self.pipeline = None
             self.config = None
             self.device = None
+            self._devices = None
             logger.info("Camera disconnected")
         except Exception as e:
             logger.error(f"Error during disconnect: {e}")
@@ -160,6 +178,16 @@ class CameraManager:
             logger.error(f"Failed to get intrinsics: {e}")
             return {}
     
+    def _limit_frame_queues(self):
+        """Shrink every sensor's internal frame queue to FRAMES_QUEUE_SIZE"""
+        for sensor in self.device.query_sensors():
+            if not sensor.supports(rs.option.frames_queue_size):
+                continue
+            try:
+                sensor.set_option(rs.option.frames_queue_size, self.FRAMES_QUEUE_SIZE)
+            except Exception as e:
+                logger.warning(f"Could not set frame queue size on sensor: {e}")
+
     def _configure_streams(self):
         """Configure RGB and depth streams with fixed optimal settings"""
         try:
@@ -1,11 +1,13 @@
 # src/hardware/frame_capture.py
 import logging
+import queue
 
 import numpy as np
 import pyrealsense2 as rs
 
 from src.hardware.camera_manager import CameraManager
 from src.hardware.exceptions import FrameCaptureError
+from src.hardware.frame_ring import FrameRing
 
 logger = logging.getLogger(__name__)
 
@@ -18,16 +20,26 @@ class FrameCapturer:
     - Depth-to-RGB alignment
     - Data conversion to numpy arrays
     - Frame timing and counting
+
+    Frames are copied into a fixed ring of preallocated buffers. Each
+    capture takes a free slot and the consumer hands it back with
+    release_slot, so the RealSense frame is released right away and no new
+    arrays are allocated per frame. With shared_memory=True the ring can be
+    consumed by another process (see SaverProcess).
     """
 
     DEFAULT_DEPTH_SCALE = 0.001
+    DROPPED_LOG_INTERVAL = 300  # dropped framesets between warnings
+    RING_SIZE = 8
+    SLOT_TIMEOUT = 5.0  # seconds to wait for a consumer to release a slot
 
-    def __init__(self, camera_manager: CameraManager):
+    def __init__(self, camera_manager: CameraManager, shared_memory: bool = False):
         """
         Initialize frame capturer.
         
         Args:
             camera_manager: Connected CameraManager instance
+            shared_memory: Back the frame ring with shared memory
 
         """
         if not camera_manager.is_connected():
@@ -40,20 +52,91 @@ class FrameCapturer:
         self.align = rs.align(rs.stream.color)
 
         self.frame_count = 0
+        self.dropped_frames = 0
         self._depth_scale: float | None = None
-        logger.info("FrameCapturer initialized")
+        self._depth_luts: dict[np.dtype, np.ndarray] = {}
+
+        # Depth is aligned to color, so both buffers use the color resolution.
+        # Shapes are fixed by the stream profile and cached for per-frame use.
+        height, width = camera_manager.RGB_HEIGHT, camera_manager.RGB_WIDTH
+        self._rgb_shape = (height, width, 3)
+        self._depth_shape = (height, width)
+        self.ring = FrameRing(
+            self.RING_SIZE, self._rgb_shape, self._depth_shape, shared=shared_memory
+        )
+
+        # Flat byte views of every slot, built once: copying a frame is then a
+        # single memoryview slice assignment (memcpy) with no per-frame numpy
+        # array construction, reshape or dtype dispatch
+        self._slot_views = [
+            tuple(memoryview(buffer).cast("B") for buffer in self.ring.get(slot))
+            for slot in range(self.RING_SIZE)
+        ]
+
+        logger.info(f"FrameCapturer initialized ({self.RING_SIZE} frame buffers)")
 
-    def capture_frame(self) -> tuple[np.ndarray, np.ndarray]:
+    def capture_frame(self) -> int:
         """
-        Capture one aligned RGB-depth frame pair.
+        Capture one aligned RGB-depth frame pair into a free ring slot.
+
+        Blocks while every slot is still held by a consumer. The slot's
+        buffers (see get_slot) stay untouched until release_slot is called.
         
         Returns:
-            tuple: (rgb_frame, depth_frame) as numpy arrays
+            int: slot index; get_slot(slot) gives (rgb_frame, depth_frame)
                 - rgb_frame: shape (H, W, 3), dtype uint8, BGR format
                 - depth_frame: shape (H, W), dtype uint16, mm
 
         """
+        slot = self._acquire_slot()
+        try:
+            self._capture_into(slot)
+        except BaseException:
+            self.release_slot(slot)
+            raise
+        return slot
+
+    def get_slot(self, slot: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the buffers of a ring slot.
+
+        Args:
+            slot: int, index returned by capture_frame
 
+        Returns:
+            tuple: (rgb_frame, depth_frame) numpy arrays owned by the ring
+        """
+        return self.ring.get(slot)
+
+    def release_slot(self, slot: int):
+        """
+        Return a slot to the ring once its frames are no longer needed.
+
+        Thread-safe; typically called from an I/O worker after writing.
+
+        Args:
+            slot: int, index returned by capture_frame
+        """
+        self.ring.release(slot)
+
+    def close(self):
+        """Release the frame ring (frees shared memory when used)."""
+        for views in self._slot_views:
+            for view in views:
+                view.release()
+        self._slot_views = []
+        self.ring.close()
+
+    def _acquire_slot(self) -> int:
+        try:
+            return self.ring.acquire(timeout=self.SLOT_TIMEOUT)
+        except queue.Empty:
+            raise FrameCaptureError(
+                f"No free frame buffer after {self.SLOT_TIMEOUT}s; "
+                f"consumers are not releasing slots"
+            )
+
+    def _capture_into(self, slot: int):
         try:
 
             # Wait for frames (timeout prevents hanging)
@@ -61,6 +144,10 @@ class FrameCapturer:
 
             if not frames:
                 raise FrameCaptureError("Received empty frameset")
+
+            # Drain anything queued behind it so we always process the newest
+            # frameset and latency stays bounded when the consumer falls behind
+            frames = self._drain_to_latest(frames)
             
             # Apply alignment (depth → color coordinate system)
             aligned_frames = self.align.process(frames)
@@ -73,15 +160,12 @@ class FrameCapturer:
             if not color_frame or not depth_frame:
                 raise FrameCaptureError("Missing aligned frames")
             
-            # Convert to numpy arrays
-            # Copy buffers so data persists after RealSense frame objects are released
-            rgb_array = np.asanyarray(color_frame.get_data()).copy()  # (H, W, 3)
-            depth_array = np.asanyarray(depth_frame.get_data()).copy()  # (H, W)
+            # Copy into the slot's preallocated buffers; the RealSense frames
+            # go back to the SDK pool as soon as they fall out of scope
+            self._unpack_into(slot, color_frame, depth_frame)
             
             # Increment counter
             self.frame_count += 1
-            
-            return rgb_array, depth_array
 
 
         except RuntimeError as e:
@@ -94,6 +178,37 @@ class FrameCapturer:
         except Exception as e:
             raise FrameCaptureError(f"Unexpected error capturing frame: {e}")
 
+    def _unpack_into(self, slot: int, color_frame, depth_frame):
+        """
+        Copy frame data into a ring slot.
+
+        Raises ValueError when a frame's byte size does not match the stream
+        profile the ring was sized for.
+        """
+        rgb_view, depth_view = self._slot_views[slot]
+        rgb_view[:] = memoryview(color_frame.get_data()).cast("B")
+        depth_view[:] = memoryview(depth_frame.get_data()).cast("B")
+
+    def _drain_to_latest(self, frames):
+        """Return the newest available frameset, discarding older ones."""
+        dropped = 0
+        while True:
+            newer = self.pipeline.poll_for_frames()
+            if not newer:
+                break
+            frames = newer
+            dropped += 1
+
+        if dropped:
+            previous = self.dropped_frames
+            self.dropped_frames += dropped
+            if previous // self.DROPPED_LOG_INTERVAL != self.dropped_frames // self.DROPPED_LOG_INTERVAL:
+                logger.warning(
+                    f"Dropped {self.dropped_frames} stale frameset(s) so far; "
+                    f"consumer is slower than the camera"
+                )
+        return frames
+
     def get_frame_count(self):
         """
         Get total frames captured since initialization.
@@ -103,6 +218,15 @@ class FrameCapturer:
         """
         return self.frame_count
     
+    def get_dropped_frames(self):
+        """
+        Get total stale framesets discarded to keep up with the camera.
+
+        Returns:
+            int: Dropped frameset count
+        """
+        return self.dropped_frames
+
     def get_depth_scale(self):
         """
         Get depth scale factor for converting depth values to meters.
@@ -132,6 +256,47 @@ class FrameCapturer:
             self._depth_scale = self.DEFAULT_DEPTH_SCALE
             return self._depth_scale
     
+    def get_depth_lut(self, dtype=np.float16) -> np.ndarray:
+        """
+        Get a lookup table mapping every raw uint16 depth value to meters.
+
+        Converting through the table is a single gather (`lut[depth_array]`)
+        instead of a float multiply over the whole frame, and float16 halves
+        the output bandwidth compared to float32.
+
+        Args:
+            dtype: numpy float dtype of the table (float16 or float32)
+
+        Returns:
+            numpy array (65536,), dtype `dtype`, meters
+        """
+        dtype = np.dtype(dtype)
+        lut = self._depth_luts.get(dtype)
+        if lut is None:
+            scale = self.get_depth_scale()
+            lut = (np.arange(65536, dtype=np.float32) * scale).astype(dtype)
+            self._depth_luts[dtype] = lut
+        return lut
+
+    def depth_to_meters(self, depth_array, dtype=np.float16, out=None):
+        """
+        Convert a raw depth frame to meters.
+
+        Args:
+            depth_array: numpy array (H, W), uint16
+            dtype: numpy float dtype of the result (float16 or float32)
+            out: optional preallocated (H, W) array of `dtype` to write into
+
+        Returns:
+            numpy array (H, W), dtype `dtype`, meters
+
+        Example:
+            slot = capturer.capture_frame()
+            _, depth = capturer.get_slot(slot)
+            meters = capturer.depth_to_meters(depth)
+        """
+        return np.take(self.get_depth_lut(dtype), depth_array, out=out)
+
     def get_depth_intrinsics(self):
         """
         Get depth camera intrinsic parameters.
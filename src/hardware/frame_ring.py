@@ -0,0 +1,152 @@
+# src/hardware/frame_ring.py
+import logging
+import mmap
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FrameRing:
+    """
+    Fixed pool of preallocated (rgb, depth) buffer pairs with a free-slot queue.
+
+    A producer acquires a free slot, fills it and hands the slot index to a
+    consumer, which releases it once done (bounded-buffer producer/consumer).
+
+    Each slot is one page-aligned memory block, RGB first and depth at the
+    next page boundary after it, so buffers can be handed to O_DIRECT writers without a copy.
+    With shared=True the blocks are SharedMemory and the free-slot queue is
+    a multiprocessing queue, so a child process can attach() to the ring,
+    read slots in place and release them itself; otherwise they are
+    anonymous mmaps.
+    """
+
+    def __init__(self, slots: int, rgb_shape, depth_shape, shared: bool = False, mp_context=None):
+        """
+        Initialize frame ring.
+
+        Args:
+            slots: int, number of buffer pairs
+            rgb_shape: tuple (H, W, 3) of the uint8 RGB buffers
+            depth_shape: tuple (H, W) of the uint16 depth buffers
+            shared: bool, back the buffers with shared memory
+            mp_context: multiprocessing context for the shared free-slot queue
+                (default "spawn"); consumer processes must use the same one
+        """
+        self.slots = slots
+        self.rgb_shape = tuple(rgb_shape)
+        self.depth_shape = tuple(depth_shape)
+        self.shared = shared
+        self._owner = True
+        self._shm: list[shared_memory.SharedMemory] = []
+        self._mmaps: list[mmap.mmap] = []
+        self.mp_context = None
+
+        if shared:
+            self.mp_context = mp_context or multiprocessing.get_context("spawn")
+            self._free = self.mp_context.Queue(maxsize=slots)
+            self._shm = [
+                shared_memory.SharedMemory(create=True, size=self._slot_bytes())
+                for _ in range(slots)
+            ]
+        else:
+            self._free = queue.Queue(maxsize=slots)
+            self._mmaps = [mmap.mmap(-1, self._slot_bytes()) for _ in range(slots)]
+
+        self._buffers = [self._make_buffers(slot) for slot in range(slots)]
+        for slot in range(slots):
+            self._free.put_nowait(slot)
+
+        logger.info(
+            f"FrameRing initialized ({slots} slots, "
+            f"{'shared' if shared else 'process-local'} memory)"
+        )
+
+    @classmethod
+    def attach(cls, spec: dict) -> "FrameRing":
+        """
+        Attach to a shared ring created in another process.
+
+        Args:
+            spec: dict returned by spec() in the owning process
+
+        Returns:
+            FrameRing: view of the same buffers and free-slot queue
+        """
+        ring = cls.__new__(cls)
+        ring.slots = len(spec['names'])
+        ring.rgb_shape = spec['rgb_shape']
+        ring.depth_shape = spec['depth_shape']
+        ring.shared = True
+        ring.mp_context = None
+        ring._owner = False
+        ring._mmaps = []
+        ring._free = spec['free']
+        ring._shm = [shared_memory.SharedMemory(name=name) for name in spec['names']]
+        ring._buffers = [ring._make_buffers(slot) for slot in range(ring.slots)]
+        return ring
+
+    def spec(self) -> dict:
+        """
+        Describe a shared ring so another process can attach() to it.
+
+        Must be passed to the child when it is started (it contains the
+        multiprocessing free-slot queue).
+        """
+        if not self.shared:
+            raise ValueError("Only a shared FrameRing can be attached from another process")
+        return {
+            'names': [shm.name for shm in self._shm],
+            'rgb_shape': self.rgb_shape,
+            'depth_shape': self.depth_shape,
+            'free': self._free,
+        }
+
+    def acquire(self, timeout: float | None = None) -> int:
+        """
+        Take a free slot, blocking until one is released.
+
+        Raises:
+            queue.Empty: if no slot becomes free within `timeout` seconds
+        """
+        return self._free.get(timeout=timeout)
+
+    def release(self, slot: int):
+        """Return a slot to the pool (thread- and process-safe)."""
+        self._free.put_nowait(slot)
+
+    def get(self, slot: int) -> tuple[np.ndarray, np.ndarray]:
+        """Get the (rgb, depth) buffers of a slot."""
+        return self._buffers[slot]
+
+    def close(self):
+        """Unmap shared buffers; the owning process also frees them."""
+        self._buffers = []
+        for shm in self._shm:
+            try:
+                shm.close()
+            except BufferError:
+                # A caller still holds a view; the mapping goes away with the process
+                pass
+            if self._owner:
+                shm.unlink()
+        self._shm = []
+        self._mmaps = []
+
+    def _slot_bytes(self) -> int:
+        return self._depth_offset() + int(np.prod(self.depth_shape)) * np.dtype(np.uint16).itemsize
+
+    def _depth_offset(self) -> int:
+        rgb_bytes = int(np.prod(self.rgb_shape)) * np.dtype(np.uint8).itemsize
+        return -(-rgb_bytes // mmap.PAGESIZE) * mmap.PAGESIZE
+
+    def _make_buffers(self, slot: int) -> tuple[np.ndarray, np.ndarray]:
+        buf = self._shm[slot].buf if self.shared else self._mmaps[slot]
+        return (
+            np.ndarray(self.rgb_shape, dtype=np.uint8, buffer=buf),
+            np.ndarray(self.depth_shape, dtype=np.uint16, buffer=buf, offset=self._depth_offset()),
+        )
@@ -0,0 +1,31 @@
+# src/json_io.py
+import json
+import os
+
+
+def write_json(path, obj):
+    """
+    Serialize `obj` compactly and write it to `path` with raw os.write.
+
+    The document is encoded in one go rather than streamed token by token
+    through json.dump, which matters for files that grow with session length.
+
+    Args:
+        path: str or Path, output file (created or truncated)
+        obj: JSON-serializable object
+
+    Raises:
+        TypeError: if `obj` is not JSON-serializable (nothing is written)
+    """
+    data = json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _write_all(fd, memoryview(data))
+    finally:
+        os.close(fd)
+
+
+def _write_all(fd, data):
+    """os.write until every byte of `data` is written."""
+    while data:
+        data = data[os.write(fd, data):]
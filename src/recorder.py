@@ -1,25 +1,166 @@
 from pathlib import Path
 import logging
+import errno
 import os
-import json
+import mmap
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import cv2
 from datetime import datetime
 
+from src.json_io import write_json
+from src.video import H264Writer
+
+try:
+    from turbojpeg import TJPF_BGR, TJSAMP_420, TurboJPEG
+except ImportError:  # PyTurboJPEG is optional; OpenCV encodes JPEG otherwise
+    TurboJPEG = None
+
 logger = logging.getLogger(__name__)
 
+# fdatasync skips flushing unchanged inode metadata; not available everywhere
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
 class DataRecorder:
     """
     Records RGB-depth frame pairs to disk.
+
+    Encoding and file writes run on a background thread pool so the
+    capture loop only pays for validation and a queue hand-off.
+
+    RGB codecs:
+    - "png": one lossless PNG per frame
+    - "mjpeg": one JPEG per frame, encoded with libjpeg-turbo through
+      PyTurboJPEG when available, otherwise with OpenCV
+    - "h264": all frames in a single rgb.mp4 (needs PyAV), with
+      rgb_frame_index.json mapping frame index to presentation timestamp
+
+    Durability: with sync_every=N the workers fdatasync the files of every
+    N completed frames as one batch (plus depth.bin and the output
+    directories); rgb.mp4 is written by the encoder thread, so it is never
+    part of a batch and is only synced on close(). With 0 nothing is synced
+    while recording and close() syncs every file of the session once.
+
+    Depth storage modes:
+    - "png": one 16-bit PNG per frame (lossless, typically 3-5x smaller than NPY)
+    - "bin": all frames in a single raw depth.bin, frame i at offset
+      i * frame_bytes, described by depth_index.json. Written with O_DIRECT
+      where supported so long sessions do not fill the page cache with
+      dirty pages and stall on writeback.
+    - "npy": one NPY file per frame
     """
-    
-    def __init__(self):
-        """Initialize data recorder."""
-        logger.info("DataRecorder initialized")
+
+    IO_WORKERS = 3
+    MAX_PENDING_WRITES = 64
+    PNG_COMPRESSION = 1  # OpenCV default is 3; level 1 deflates ~2-3x faster
+    JPEG_QUALITY = 90
+    RGB_CODECS = ("png", "mjpeg", "h264")
+    RGB_VIDEO_NAME = "rgb.mp4"
+    DEPTH_STORAGES = ("png", "bin", "npy")
+    DEPTH_BLOB_NAME = "depth.bin"
+    DEPTH_INDEX_NAME = "depth_index.json"
+    DEPTH_BLOB_DIRECT_IO = True
+    DIRECT_IO_ALIGNMENT = 4096  # buffer address, offset and length granularity
+
+    def __init__(
+        self,
+        io_workers: int = IO_WORKERS,
+        depth_storage: str = "png",
+        rgb_codec: str = "png",
+        video_fps: int = 30,
+        depth_lut=None,
+        sync_every: int = 0,
+    ):
+        """
+        Initialize data recorder.
+
+        Args:
+            io_workers: int, number of background threads encoding/writing frames
+            depth_storage: str, one of DEPTH_STORAGES
+            rgb_codec: str, one of RGB_CODECS
+            video_fps: int, frame rate written into the "h264" RGB video
+            depth_lut: optional numpy array (65536,) mapping raw uint16 depth
+                to the stored value, e.g. meters from FrameCapturer.get_depth_lut.
+                Applied on the I/O workers; not supported with "png" storage.
+            sync_every: int, frames per fdatasync batch (0 = sync once on close)
+
+        Raises:
+            ValueError: on an unknown rgb_codec or depth_storage, a
+                depth_lut combined with "png" depth storage, or a negative
+                sync_every
+            RuntimeError: if rgb_codec is "h264" and PyAV is not installed
+        """
+        if depth_storage not in self.DEPTH_STORAGES:
+            raise ValueError(
+                f"depth_storage must be one of {self.DEPTH_STORAGES}, got {depth_storage!r}"
+            )
+        if rgb_codec not in self.RGB_CODECS:
+            raise ValueError(
+                f"rgb_codec must be one of {self.RGB_CODECS}, got {rgb_codec!r}"
+            )
+        if rgb_codec == "h264" and not H264Writer.is_available():
+            raise RuntimeError("rgb_codec 'h264' requires PyAV (pip install av)")
+
+        if sync_every < 0:
+            raise ValueError(f"sync_every must be >= 0, got {sync_every}")
+        if depth_lut is not None and depth_storage == "png":
+            raise ValueError("PNG depth storage only supports raw uint16 depth (no depth_lut)")
+
+        self.depth_storage = depth_storage
+        self.depth_lut = depth_lut
+        self.sync_every = sync_every
+        self._sync_lock = threading.Lock()
+        self._unsynced_paths = []
+        self._unsynced_frames = 0
+        self.rgb_codec = rgb_codec
+        self.video_fps = video_fps
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=io_workers, thread_name_prefix="recorder-io"
+        )
+        self._pending = deque()
+        self._png_params = [cv2.IMWRITE_PNG_COMPRESSION, self.PNG_COMPRESSION]
+        self._jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, self.JPEG_QUALITY]
+        self._rgb_ext = "jpg" if rgb_codec == "mjpeg" else "png"
+        self._turbojpeg = self._load_turbojpeg() if rgb_codec == "mjpeg" else None
+
+        # The video encoder needs frames in order, so it gets its own single thread
+        self._video_writer = None
+        self._video_pool = None
+        if rgb_codec == "h264":
+            self._video_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="recorder-video"
+            )
+
+        # Per-session output locations, set by create_session_directory
+        self.session_dir = None
+        self.rgb_dir = None
+        self.depth_dir = None
+        self._rgb_prefix = None
+        self._depth_prefix = None
+        self._validated = False
+
+        # Single-file depth blob state ("bin" storage)
+        self._depth_blob_path = None
+        self._depth_blob_fd = None
+        self._depth_blob_direct = False
+        self._bounce = threading.local()  # per-worker aligned copy buffer
+        self._depth_layout = None  # (shape, dtype) of the first depth frame
+        self._depth_count = 0  # frames durably in depth.bin (1 + highest written index)
+        self._depth_count_lock = threading.Lock()
+
+        logger.info(
+            f"DataRecorder initialized ({io_workers} I/O workers, "
+            f"RGB codec: {rgb_codec}, depth storage: {depth_storage})"
+        )
 
     def create_session_directory(self, base_dir):
         """
         Create timestamped session directory.
+
+        Output paths for the session are resolved here once, so
+        save_frame_pair only has to format the frame number.
         
         Args:
             base_dir: str or Path, base output directory
@@ -37,72 +178,382 @@ class DataRecorder:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         session_name = f"session_{timestamp}"
         session_dir = base_path / session_name
+        # h264 + bin creates no subdirectory, but rgb.mp4 and depth.bin live here
+        session_dir.mkdir(parents=True, exist_ok=True)
 
         # Create subdirectories
-        rgb_dir = session_dir / "rgb"
-        depth_dir = session_dir / "depth"
+        if self.rgb_codec == "h264":
+            self.rgb_dir = None
+            self._open_video(session_dir / self.RGB_VIDEO_NAME)
+            self._rgb_prefix = os.fspath(self._video_writer.path)
+        else:
+            self.rgb_dir = session_dir / "rgb"
+            self.rgb_dir.mkdir(parents=True, exist_ok=True)
+            self._rgb_prefix = os.path.join(os.fspath(self.rgb_dir), "frame_")
+
+        if self.depth_storage == "bin":
+            self.depth_dir = None
+            self._open_depth_blob(session_dir / self.DEPTH_BLOB_NAME)
+            self._depth_prefix = os.fspath(self._depth_blob_path)
+        else:
+            self.depth_dir = session_dir / "depth"
+            self.depth_dir.mkdir(parents=True, exist_ok=True)
+            self._depth_prefix = os.path.join(os.fspath(self.depth_dir), "frame_")
 
-        rgb_dir.mkdir(parents=True, exist_ok=True)
-        depth_dir.mkdir(parents=True, exist_ok=True)
+        self.session_dir = session_dir
+        self._validated = False
 
         logger.info(f"Created session directory: {session_dir}")
         return str(session_dir)
     
-    def save_frame_pair(self, frame_idx, rgb_array, depth_array, session_dir):
+    def save_frame_pair(self, frame_idx, rgb_array, depth_array, on_written=None):
         """
-        Save aligned RGB-depth frame pair.
+        Queue aligned RGB-depth frame pair for writing into the current session.
+
+        The arrays are handed to an I/O worker as-is, so the caller must not
+        modify or reuse them until `on_written` has been called. When
+        MAX_PENDING_WRITES writes are in flight this blocks on the oldest
+        one, which also re-raises its error.
+        Array dtype/shape are validated on the first frame of a session only;
+        the camera stream profile is fixed for the whole session.
         
         Args:
             frame_idx: int, frame index (0-based)
             rgb_array: numpy array (H, W, 3), uint8
-            depth_array: numpy array (H, W), uint16
-            session_dir: str or Path, session directory path
+            depth_array: numpy array (H, W), uint16 (C-contiguous for "bin" storage)
+            on_written: optional callable run on a worker thread once both
+                arrays are no longer needed, whether or not the writes
+                succeeded (e.g. to release a capture buffer)
         
         Returns:
-            dict: paths to saved files
+            dict: paths the files will be written to
         
         Example:
-            paths = storage.save_frame_pair(0, rgb, depth, "./session_001")
-            print(paths['rgb'])    # "./session_001/rgb/frame_000000_rgb.png"
-            print(paths['depth'])  # "./session_001/depth/frame_000000_depth.npy"
+            storage.create_session_directory("./data")
+            paths = storage.save_frame_pair(0, rgb, depth)
+            print(paths['rgb'])    # "./data/session_.../rgb/frame_000000_rgb.png"
+            print(paths['depth'])  # "./data/session_.../depth/frame_000000_depth.png"
         """
-        session_path = Path(session_dir)
-        rgb_dir = session_path / "rgb"
-        depth_dir = session_path / "depth"
+        if self.session_dir is None:
+            raise RuntimeError("create_session_directory must be called before save_frame_pair")
+
+        if not self._validated:
+            self._validate_frame_pair(rgb_array, depth_array)
+            self._validated = True
+
+        # Generate filenames
+        if self.rgb_dir is None:
+            rgb_path = self._rgb_prefix
+        else:
+            rgb_path = f"{self._rgb_prefix}{frame_idx:06d}_rgb.{self._rgb_ext}"
+
+        if self.depth_dir is None:
+            depth_path = self._depth_prefix
+        else:
+            depth_path = f"{self._depth_prefix}{frame_idx:06d}_depth.{self.depth_storage}"
+
+        # Apply backpressure instead of queueing frames without bound
+        while len(self._pending) >= self.MAX_PENDING_WRITES:
+            self._pending.popleft().result()
+
+        futures = []
+        if self._video_pool is not None:
+            futures.append(
+                self._video_pool.submit(self._video_writer.write, frame_idx, rgb_array)
+            )
+            rgb_array = None
 
+        futures.append(
+            self._io_pool.submit(
+                self._write_pair,
+                frame_idx,
+                rgb_path,
+                rgb_array,
+                depth_path,
+                depth_array,
+            )
+        )
+        if on_written is not None:
+            self._call_when_done(futures, on_written)
+        self._pending.extend(futures)
+
+        return {
+            'rgb': rgb_path,
+            'depth': depth_path
+        }
+
+    def _validate_frame_pair(self, rgb_array, depth_array):
         if rgb_array.dtype != np.uint8 or rgb_array.ndim != 3 or rgb_array.shape[2] != 3:
             raise ValueError("rgb_array must be an HxWx3 uint8 array.")
 
         if depth_array.dtype != np.uint16 or depth_array.ndim != 2:
             raise ValueError("depth_array must be an HxW uint16 array.")
 
-        rgb_dir.mkdir(parents=True, exist_ok=True)
-        depth_dir.mkdir(parents=True, exist_ok=True)
+        if self.depth_storage == "bin":
+            if not depth_array.flags.c_contiguous:
+                raise ValueError("depth_array must be C-contiguous for 'bin' depth storage.")
+            dtype = depth_array.dtype if self.depth_lut is None else self.depth_lut.dtype
+            self._depth_layout = (depth_array.shape, dtype)
 
-        # Generate filenames
-        rgb_filename = f"frame_{frame_idx:06d}_rgb.png"
-        depth_filename = f"frame_{frame_idx:06d}_depth.npy"
+            frame_bytes = int(np.prod(depth_array.shape)) * dtype.itemsize
+            if self._depth_blob_direct and frame_bytes % self.DIRECT_IO_ALIGNMENT:
+                logger.warning(
+                    f"Depth frame size {frame_bytes} is not a multiple of "
+                    f"{self.DIRECT_IO_ALIGNMENT}, writing {self.DEPTH_BLOB_NAME} buffered"
+                )
+                self._disable_direct_io()
 
-        rgb_path = rgb_dir / rgb_filename
-        depth_path = depth_dir / depth_filename
+    @staticmethod
+    def _call_when_done(futures, callback):
+        """Run `callback` once after every future in `futures` has finished."""
+        remaining = len(futures)
+        lock = threading.Lock()
 
-        # Save RGB as PNG
-        if not cv2.imwrite(str(rgb_path), rgb_array):
-            raise IOError(f"Failed to write RGB frame to {rgb_path}")
+        def _on_done(_future):
+            nonlocal remaining
+            with lock:
+                remaining -= 1
+                last = remaining == 0
+            if last:
+                callback()
 
-        # Save depth as NPY (preserves uint16, millimeter precision)
-        np.save(str(depth_path), depth_array)
+        for future in futures:
+            future.add_done_callback(_on_done)
 
-        logger.debug(f"Saved frame {frame_idx}: RGB={rgb_filename}, Depth={depth_filename}")
+    def _write_pair(self, frame_idx, rgb_path, rgb_array, depth_path, depth_array):
+        """
+        Encode and write one frame pair (runs on an I/O worker thread).
 
-        return {
-            'rgb': str(rgb_path),
-            'depth': str(depth_path)
-        }
+        `rgb_array` is None when RGB goes to the video encoder instead.
+        """
+        # Save RGB as PNG or JPEG
+        if rgb_array is None:
+            pass
+        elif self.rgb_codec == "mjpeg":
+            self._write_jpeg(rgb_path, rgb_array)
+        else:
+            self._write_png(rgb_path, rgb_array)
+
+        # Save depth, raw uint16 millimeters unless a lookup table converts it
+        if self.depth_lut is not None:
+            depth_array = np.take(self.depth_lut, depth_array)
+
+        if self.depth_storage == "png":
+            self._write_png(depth_path, depth_array)
+        elif self.depth_storage == "bin":
+            offset = frame_idx * depth_array.nbytes
+            if self._depth_blob_direct and depth_array.ctypes.data % self.DIRECT_IO_ALIGNMENT:
+                depth_array = self._aligned_copy(depth_array)
+            self._pwrite_all(self._depth_blob_fd, memoryview(depth_array).cast("B"), offset)
+            # Counted only once written, so depth_index.json never outgrows the file
+            with self._depth_count_lock:
+                self._depth_count = max(self._depth_count, frame_idx + 1)
+        else:
+            np.save(depth_path, depth_array)
+
+        if self.sync_every:
+            written = []
+            if rgb_array is not None:
+                written.append(rgb_path)
+            if self.depth_storage != "bin":
+                written.append(depth_path)
+            self._frame_written(written)
+
+    def _frame_written(self, paths):
+        """Count a finished frame; the worker completing a batch syncs it."""
+        with self._sync_lock:
+            self._unsynced_paths.extend(paths)
+            self._unsynced_frames += 1
+            if self._unsynced_frames < self.sync_every:
+                return
+            batch = self._unsynced_paths
+            self._unsynced_paths = []
+            self._unsynced_frames = 0
+        self._sync_batch(batch)
+
+    def _sync_batch(self, paths):
+        """fdatasync a batch of frame files, depth.bin and the output directories."""
+        for path in paths:
+            self._sync_path(path)
+        if self._depth_blob_fd is not None:
+            _fdatasync(self._depth_blob_fd)
+        for directory in (self.rgb_dir, self.depth_dir):
+            if directory is not None:
+                self._sync_path(directory, os.fsync)
+
+    @staticmethod
+    def _sync_path(path, sync=None):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            (sync or _fdatasync)(fd)
+        finally:
+            os.close(fd)
+
+    def _final_sync(self):
+        """Make everything written this session durable (called by close)."""
+        if self.session_dir is None:
+            return
+
+        if not self.sync_every:
+            # Only this session's output, not every mounted filesystem (os.sync)
+            batch = [
+                os.path.join(root, name)
+                for root, _, files in os.walk(self.session_dir)
+                for name in files
+            ]
+            self._sync_batch(batch)
+            self._sync_path(self.session_dir, os.fsync)
+            return
+
+        with self._sync_lock:
+            batch = self._unsynced_paths
+            self._unsynced_paths = []
+            self._unsynced_frames = 0
+
+        # Whole-session files written outside the frame batches
+        video_index = f"{Path(self.RGB_VIDEO_NAME).stem}_frame_index.json"
+        for name in ("metadata.json", self.DEPTH_INDEX_NAME, self.RGB_VIDEO_NAME, video_index):
+            path = os.path.join(self.session_dir, name)
+            if os.path.exists(path):
+                batch.append(path)
+
+        self._sync_batch(batch)
+        self._sync_path(self.session_dir, os.fsync)
+
+    def _write_jpeg(self, path, array):
+        if self._turbojpeg is None:
+            self._write_encoded(path, ".jpg", array, self._jpeg_params)
+            return
+
+        buf = self._turbojpeg.encode(
+            array,
+            quality=self.JPEG_QUALITY,
+            pixel_format=TJPF_BGR,
+            jpeg_subsample=TJSAMP_420,
+        )
+        with open(path, 'wb') as f:
+            f.write(buf)
+
+    def _write_png(self, path, array):
+        self._write_encoded(path, ".png", array, self._png_params)
+
+    @staticmethod
+    def _write_encoded(path, ext, array, params):
+        ok, buf = cv2.imencode(ext, array, params)
+        if not ok:
+            raise IOError(f"Failed to encode {ext} for {path}")
+        with open(path, 'wb') as f:
+            f.write(buf)
+
+    @staticmethod
+    def _load_turbojpeg():
+        """Return a TurboJPEG encoder, or None to fall back to cv2.imencode."""
+        if TurboJPEG is None:
+            logger.info("PyTurboJPEG not installed, encoding JPEG with OpenCV")
+            return None
+        try:
+            return TurboJPEG()
+        except Exception as e:  # package installed but libturbojpeg not found
+            logger.warning(f"libturbojpeg unavailable, encoding JPEG with OpenCV: {e}")
+            return None
+
+    def _open_video(self, path):
+        self._close_video()
+        self._video_writer = H264Writer(path, self.video_fps)
+
+    def _close_video(self):
+        if self._video_writer is not None:
+            self._video_writer.close()
+            self._video_writer = None
+
+    @staticmethod
+    def _pwrite_all(fd, data, offset):
+        """os.pwrite until every byte of `data` is written at `offset`."""
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+
+    def _aligned_copy(self, array):
+        """Copy `array` into this worker's page-aligned bounce buffer for O_DIRECT."""
+        bounce = getattr(self._bounce, 'buffer', None)
+        if bounce is None or bounce.nbytes != array.nbytes:
+            # Anonymous mmaps are page-aligned
+            bounce = np.frombuffer(mmap.mmap(-1, array.nbytes), dtype=np.uint8)
+            self._bounce.buffer = bounce
+        aligned = bounce.view(array.dtype).reshape(array.shape)
+        np.copyto(aligned, array)
+        return aligned
+
+    def _open_depth_blob(self, path):
+        self._close_depth_blob()
+        self._depth_blob_path = path
+        self._depth_layout = None
+        self._depth_count = 0
+
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        if self.DEPTH_BLOB_DIRECT_IO and hasattr(os, 'O_DIRECT'):
+            try:
+                self._depth_blob_fd = os.open(path, flags | os.O_DIRECT, 0o644)
+                self._depth_blob_direct = True
+                return
+            except OSError as e:
+                # Only the filesystem refusing O_DIRECT warrants a buffered retry
+                if e.errno not in (errno.EINVAL, errno.EOPNOTSUPP):
+                    raise
+                logger.warning(f"O_DIRECT unavailable for {path}, writing buffered: {e}")
+
+        self._depth_blob_fd = os.open(path, flags, 0o644)
+        self._depth_blob_direct = False
+
+    def _disable_direct_io(self):
+        """Reopen depth.bin buffered; only valid before the first frame is queued."""
+        os.close(self._depth_blob_fd)
+        self._depth_blob_fd = os.open(self._depth_blob_path, os.O_WRONLY, 0o644)
+        self._depth_blob_direct = False
+
+    def _close_depth_blob(self):
+        if self._depth_blob_fd is not None:
+            os.close(self._depth_blob_fd)
+            self._depth_blob_fd = None
+
+    def flush(self):
+        """
+        Block until all queued frame writes have finished.
+
+        Returns:
+            int: number of writes that failed (each failure is logged)
+        """
+        failed = 0
+        while self._pending:
+            try:
+                self._pending.popleft().result()
+            except Exception:
+                failed += 1
+                logger.exception("Failed to write frame pair")
+        return failed
+
+    def close(self):
+        """Flush pending writes, stop the I/O workers and close open files."""
+        self.flush()
+        self._io_pool.shutdown(wait=True)
+        if self._video_pool is not None:
+            self._video_pool.shutdown(wait=True)
+        self._close_video()
+        try:
+            self._final_sync()
+        except OSError:
+            logger.exception("Failed to sync recorded files to disk")
+        self._close_depth_blob()
     
     def save_metadata(self, session_dir, metadata):
         """
-        Save session metadata as JSON.
+        Save session metadata as compact JSON.
+
+        The document is serialized in one go and written with a single
+        os.write rather than streamed token by token through json.dump.
+        With "bin" depth storage this also writes depth_index.json, so call
+        it after flush().
         
         Args:
             session_dir: str or Path, session directory
@@ -117,13 +568,35 @@ class DataRecorder:
             }
             storage.save_metadata(session_dir, metadata)
         """
-        metadata_path = Path(session_dir) / "metadata.json"
+        metadata_path = os.path.join(session_dir, "metadata.json")
 
         try:
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
+            write_json(metadata_path, metadata)
         except TypeError:
             logger.exception("Failed to serialize session metadata")
             raise
 
-        logger.info(f"Saved metadata to {metadata_path}")
\ No newline at end of file
+        logger.info(f"Saved metadata to {metadata_path}")
+
+        if self.depth_storage == "bin":
+            self._save_depth_index(session_dir)
+
+    def _save_depth_index(self, session_dir):
+        """Describe the depth.bin layout so readers can np.memmap it."""
+        index_path = os.path.join(session_dir, self.DEPTH_INDEX_NAME)
+        if self._depth_layout is None:
+            shape, dtype = (0, 0), np.dtype(np.uint16)
+        else:
+            shape, dtype = self._depth_layout
+
+        index = {
+            'file': self.DEPTH_BLOB_NAME,
+            'height': shape[0],
+            'width': shape[1],
+            'dtype': dtype.str,
+            'count': self._depth_count,
+            'frame_bytes': int(np.prod(shape)) * dtype.itemsize,
+        }
+        write_json(index_path, index)
+
+        logger.info(f"Saved depth index to {index_path}")
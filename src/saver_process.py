@@ -0,0 +1,196 @@
+# src/saver_process.py
+import logging
+import queue
+import signal
+from functools import partial
+
+from src.hardware.frame_ring import FrameRing
+from src.recorder import DataRecorder
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(processName)s %(name)s: %(message)s"
+
+
+class SaverProcess:
+    """
+    Runs a DataRecorder in a child process fed from a shared-memory FrameRing.
+
+    Frame data never crosses the process boundary: the parent sends
+    (frame_idx, slot) and the child reads the slot's buffers in place,
+    encodes and writes them, then puts the slot back on the ring's free
+    queue. Encoding therefore never competes with capture for the
+    parent's GIL. Session methods mirror DataRecorder.
+    """
+
+    REPLY_POLL_INTERVAL = 1.0  # seconds between child liveness checks
+    JOIN_TIMEOUT = 10.0
+
+    def __init__(self, ring: FrameRing, recorder_kwargs: dict | None = None):
+        """
+        Start the saver process.
+
+        Args:
+            ring: FrameRing created with shared=True
+            recorder_kwargs: dict, keyword arguments for the child's DataRecorder
+
+        Raises:
+            ValueError: if the ring is not shared
+            RuntimeError: if the child fails to start its DataRecorder
+        """
+        if not ring.shared:
+            raise ValueError("SaverProcess requires a FrameRing created with shared=True")
+
+        ctx = ring.mp_context
+        self._tasks = ctx.Queue()
+        self._replies = ctx.Queue()
+        self._errors = ctx.Queue()
+        self._process = ctx.Process(
+            target=_save_worker,
+            args=(
+                ring.spec(),
+                recorder_kwargs or {},
+                self._tasks,
+                self._replies,
+                self._errors,
+                logging.getLogger().getEffectiveLevel(),
+            ),
+            name="recorder-saver",
+            daemon=True,
+        )
+        self._process.start()
+        self._wait_reply()
+        logger.info(f"Saver process started (pid {self._process.pid})")
+
+    def create_session_directory(self, base_dir):
+        """Create the session directory in the child; see DataRecorder."""
+        return self._request("session", base_dir)
+
+    def save_slot(self, frame_idx, slot):
+        """
+        Queue the frame pair held in a ring slot for writing.
+
+        The child releases the slot back to the ring once it is written.
+        Like DataRecorder.save_frame_pair, this raises if an earlier frame
+        failed to write; the slot is then not queued.
+
+        Args:
+            frame_idx: int, frame index (0-based)
+            slot: int, ring slot holding the frame pair
+
+        Raises:
+            RuntimeError: if the child reported a failed frame write
+        """
+        try:
+            error = self._errors.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            raise RuntimeError(f"Saver process failed to write a frame: {error}")
+        self._tasks.put(("frame", frame_idx, slot))
+
+    def flush(self):
+        """
+        Block until every queued frame has been written.
+
+        Returns:
+            int: number of frames that failed to write (logged by the child)
+        """
+        return self._request("flush")
+
+    def save_metadata(self, session_dir, metadata):
+        """Save session metadata from the child; see DataRecorder."""
+        self._request("metadata", session_dir, metadata)
+
+    def close(self):
+        """Flush, close the child's recorder and stop the process."""
+        if self._process.is_alive():
+            try:
+                self._request("close")
+            finally:
+                self._process.join(timeout=self.JOIN_TIMEOUT)
+        if self._process.is_alive():
+            logger.warning("Saver process did not exit, terminating it")
+            self._process.terminate()
+
+    def _request(self, command, *args):
+        self._tasks.put((command, *args))
+        return self._wait_reply()
+
+    def _wait_reply(self):
+        while True:
+            try:
+                status, value = self._replies.get(timeout=self.REPLY_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError(
+                        f"Saver process exited unexpectedly (exit code {self._process.exitcode})"
+                    )
+        if status == "error":
+            raise RuntimeError(f"Saver process error: {value}")
+        return value
+
+
+def _save_worker(ring_spec, recorder_kwargs, tasks, replies, errors, log_level):
+    """Child process entry point: serve SaverProcess commands until "close"."""
+    # Ctrl+C and a group-wide SIGTERM reach this process too; both are the
+    # parent's to handle, and it drives shutdown through flush/close
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    logging.basicConfig(level=log_level, format=LOG_FORMAT)
+
+    ring = FrameRing.attach(ring_spec)
+    try:
+        recorder = DataRecorder(**recorder_kwargs)
+    except Exception as e:
+        replies.put(("error", f"{type(e).__name__}: {e}"))
+        ring.close()
+        return
+    replies.put(("ok", None))
+
+    failed = 0
+    try:
+        while True:
+            command, *args = tasks.get()
+
+            if command == "frame":
+                frame_idx, slot = args
+                rgb_array, depth_array = ring.get(slot)
+                try:
+                    recorder.save_frame_pair(
+                        frame_idx, rgb_array, depth_array, on_written=partial(ring.release, slot)
+                    )
+                except Exception as e:
+                    # Either this frame was rejected or an earlier write failed;
+                    # this slot was not queued in both cases. Only the first
+                    # failure since the last flush is logged and reported.
+                    failed += 1
+                    if failed == 1:
+                        logger.exception(f"Failed to save frame {frame_idx}")
+                        errors.put(f"{type(e).__name__}: {e}")
+                    ring.release(slot)
+                del rgb_array, depth_array
+                continue
+
+            try:
+                if command == "session":
+                    result = recorder.create_session_directory(*args)
+                elif command == "flush":
+                    result = recorder.flush() + failed
+                    failed = 0
+                elif command == "metadata":
+                    result = recorder.save_metadata(*args)
+                elif command == "close":
+                    recorder.close()
+                    replies.put(("ok", None))
+                    break
+                else:
+                    raise ValueError(f"Unknown saver command {command!r}")
+            except Exception as e:
+                logger.exception(f"Saver command {command!r} failed")
+                replies.put(("error", f"{type(e).__name__}: {e}"))
+                continue
+            replies.put(("ok", result))
+    finally:
+        ring.close()
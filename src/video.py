@@ -0,0 +1,120 @@
+# src/video.py
+from fractions import Fraction
+from pathlib import Path
+import logging
+
+import numpy as np
+
+from src.json_io import write_json
+
+try:
+    import av
+except ImportError:  # PyAV is only needed for --rgb-codec h264
+    av = None
+
+logger = logging.getLogger(__name__)
+
+
+class H264Writer:
+    """
+    Streams BGR frames into a single H.264 MP4 file.
+
+    Uses NVENC when the GPU encoder can actually be opened, otherwise falls
+    back to libx264 tuned for low latency. Frames must be written in order
+    from a single thread.
+    """
+
+    ENCODERS = ("h264_nvenc", "libx264")
+    ENCODER_OPTIONS = {
+        "h264_nvenc": {"preset": "p1", "tune": "ll", "rc": "vbr", "cq": "20"},
+        "libx264": {"preset": "ultrafast", "tune": "zerolatency", "crf": "20"},
+    }
+    PIX_FMT = "yuv420p"
+
+    def __init__(self, path, fps: int):
+        """
+        Initialize H.264 writer.
+
+        Args:
+            path: str or Path, output .mp4 file
+            fps: int, nominal frame rate used for timestamps
+
+        Raises:
+            RuntimeError: if PyAV is not installed
+        """
+        if av is None:
+            raise RuntimeError("H.264 recording requires PyAV (pip install av)")
+
+        self.path = Path(path)
+        self.index_path = self.path.with_name(f"{self.path.stem}_frame_index.json")
+        self.fps = fps
+        self._container = av.open(str(self.path), mode="w")
+        self._stream = None
+        self._frame_pts = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether PyAV is installed."""
+        return av is not None
+
+    def write(self, frame_idx: int, rgb_array: np.ndarray):
+        """
+        Encode one frame.
+
+        Args:
+            frame_idx: int, recorder frame index, stored in the frame index file
+            rgb_array: numpy array (H, W, 3), uint8, BGR
+        """
+        if self._stream is None:
+            self._open_stream(rgb_array.shape[1], rgb_array.shape[0])
+
+        frame = av.VideoFrame.from_ndarray(rgb_array, format="bgr24")
+        frame.pts = len(self._frame_pts)
+        self._frame_pts[frame_idx] = frame.pts
+        self._container.mux(self._stream.encode(frame))
+
+    def close(self):
+        """Flush the encoder, finalize the MP4 and write the frame index."""
+        if self._container is None:
+            return
+        try:
+            if self._stream is not None:
+                self._container.mux(self._stream.encode(None))
+        finally:
+            self._container.close()
+            self._container = None
+
+        index = {
+            "file": self.path.name,
+            "fps": self.fps,
+            "frames": {str(idx): pts for idx, pts in self._frame_pts.items()},
+        }
+        write_json(self.index_path, index)
+
+        logger.info(f"Saved {len(self._frame_pts)} frame(s) to {self.path}")
+
+    def _open_stream(self, width: int, height: int):
+        encoder = self._select_encoder(width, height)
+        stream = self._container.add_stream(encoder, rate=self.fps)
+        stream.width = width
+        stream.height = height
+        stream.pix_fmt = self.PIX_FMT
+        stream.time_base = Fraction(1, self.fps)
+        stream.options = self.ENCODER_OPTIONS[encoder]
+        self._stream = stream
+        logger.info(f"H.264 encoder: {encoder} ({width}x{height}@{self.fps}fps)")
+
+    def _select_encoder(self, width: int, height: int) -> str:
+        """Return the first encoder in ENCODERS that opens on this machine."""
+        for name in self.ENCODERS:
+            try:
+                ctx = av.CodecContext.create(name, "w")
+                ctx.width = width
+                ctx.height = height
+                ctx.pix_fmt = self.PIX_FMT
+                ctx.time_base = Fraction(1, self.fps)
+                ctx.open()
+                return name
+            except Exception as e:
+                logger.debug(f"Encoder {name} unavailable: {e}")
+        raise RuntimeError(f"No usable H.264 encoder found (tried {', '.join(self.ENCODERS)})")